@@ -1,15 +1,35 @@
-from typing import Union
+from typing import Callable, Literal, Union
 from fastapi.middleware.cors import CORSMiddleware # pyright: ignore[reportMissingImports]
 from fastapi import FastAPI, HTTPException # pyright: ignore[reportMissingImports]
+from fastapi.responses import ORJSONResponse # pyright: ignore[reportMissingImports]
 import yfinance as yf # pyright: ignore[reportMissingImports]
+from curl_cffi import requests as curl_requests # pyright: ignore[reportMissingImports]
 import pandas as pd # pyright: ignore[reportMissingModuleSource, reportMissingImports]
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer # pyright: ignore[reportMissingImports]
-import praw # pyright: ignore[reportMissingImports]
+import numpy as np # pyright: ignore[reportMissingImports]
+from numba import njit # pyright: ignore[reportMissingImports]
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer, BOOSTER_DICT, NEGATE, SPECIAL_CASES, C_INCR, normalize # pyright: ignore[reportMissingImports]
+import asyncpraw # pyright: ignore[reportMissingImports]
 import os
+import multiprocessing
+import re
+import string
+import time
 from dotenv import load_dotenv
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
 from sklearn.model_selection import train_test_split
 from datetime import timedelta
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from cachetools import TTLCache, cached # pyright: ignore[reportMissingModuleSource]
+from joblib import dump, load
+from skl2onnx import convert_sklearn # pyright: ignore[reportMissingImports]
+from skl2onnx.common.data_types import FloatTensorType # pyright: ignore[reportMissingImports]
+from onnxruntime import InferenceSession, SessionOptions # pyright: ignore[reportMissingImports]
+import asyncio
+import threading
 import uvicorn
 
 app = FastAPI()
@@ -28,49 +48,309 @@ app.add_middleware(
     allow_credentials=True
 )
 
-reddit = praw.Reddit(
-    client_id=client_id,
-    client_secret=client_secret,
-    user_agent="my-stock-sentiment-app by u/YourRedditUsername",
-)
+# Created on startup: asyncpraw binds its HTTP session to the event loop it is built on
+reddit: "asyncpraw.Reddit | None" = None
+
+# One HTTP session for every Yahoo call so TLS connections and Yahoo's cookie/crumb are reused.
+# yfinance only accepts curl_cffi sessions, which keep a curl handle per worker thread.
+_yf_session = curl_requests.Session(impersonate="chrome")
+
+# Yahoo Finance downloads keyed by (symbol, period, interval), kept for 15 minutes
+_yf_cache = TTLCache(maxsize=512, ttl=900)
+_yf_locks = {}
+
+@asynccontextmanager
+async def _keyed_lock(locks: dict, key):
+    # Per-key lock that is dropped once nobody holds or waits on it, so the dict only
+    # ever holds keys that are in flight
+    entry = locks.get(key)
+    if entry is None:
+        entry = locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del locks[key]
+
+async def _cached_download(symbol: str, period: str, interval: str):
+    key = (symbol.upper(), period, interval)
+    # One fetch per key at a time so concurrent requests share the download
+    async with _keyed_lock(_yf_locks, key):
+        data = _yf_cache.get(key)
+        if data is None:
+            data = await asyncio.to_thread(
+                yf.download, symbol, period=period, interval=interval, progress=False, threads=False,
+                session=_yf_session
+            )
+            if data is None or data.empty:
+                return pd.DataFrame()
+            _yf_cache[key] = data
+    # Callers modify the frame in place, so hand out a copy
+    return data.copy()
+
+async def _prefetch_downloads(symbols: list[str], period: str, interval: str):
+    # Fetch every uncached symbol in one Yahoo request and seed the per-symbol cache
+    missing = [s for s in symbols if (s.upper(), period, interval) not in _yf_cache]
+    if not missing:
+        return
+    data = await asyncio.to_thread(
+        yf.download, missing, period=period, interval=interval, group_by="ticker", progress=False, threads=True,
+        session=_yf_session
+    )
+    if data is None or data.empty or not isinstance(data.columns, pd.MultiIndex):
+        return
+    tickers = set(data.columns.get_level_values(0))
+    for symbol in missing:
+        if symbol.upper() not in tickers:
+            continue
+        frame = data.xs(symbol.upper(), level=0, axis=1).dropna(how="all")
+        if not frame.empty:
+            _yf_cache[(symbol.upper(), period, interval)] = frame
+
+# Fitted models keyed by (symbol, date of last bar, model type), kept in a small LRU together
+# with a function that predicts one feature row. Forests are also persisted to disk.
+ModelType = Literal["ridge", "random_forest"]
+_MODEL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+# Part of every model file name; bump whenever the forest's features or training change
+# so files written by older code are never loaded
+_MODEL_FILE_VERSION = 2
+# Persisted forests older than this are deleted on the next write
+_MODEL_FILE_MAX_AGE = 7 * 24 * 3600
+_MODEL_CACHE_SIZE = 64
+_model_cache: "OrderedDict[tuple[str, str, str], tuple[object, Callable[[np.ndarray], float]]]" = OrderedDict()
+
+def _onnx_session(model: RandomForestRegressor) -> InferenceSession:
+    onx = convert_sklearn(model, initial_types=[("X", FloatTensorType([None, 4]))])
+    # One row per call is far too small to split across threads, and spinning idle
+    # ORT threads would compete with the rest of the server for cores
+    options = SessionOptions()
+    options.intra_op_num_threads = 1
+    options.inter_op_num_threads = 1
+    options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+    return InferenceSession(onx.SerializeToString(), sess_options=options, providers=["CPUExecutionProvider"])
+
+def _row_predictor(model) -> Callable[[np.ndarray], float]:
+    if isinstance(model, Ridge):
+        # A linear model is just a dot product, no need to go through sklearn
+        coef, intercept = model.coef_, model.intercept_
+        return lambda row: float(row[0] @ coef + intercept)
+    session = _onnx_session(model)
+    # The ONNX graph takes float32 input; reuse one buffer for the cast
+    feed = {"X": np.empty((1, 4), dtype=np.float32)}
+    def predict(row: np.ndarray) -> float:
+        feed["X"][:] = row
+        return float(session.run(None, feed)[0][0, 0])
+    return predict
+
+# Forest training runs in worker processes shared by all requests, so concurrent
+# requests queue for cores instead of contending for them. Workers are spawned fresh
+# rather than forked, since a fork would copy locks held by this process's threads.
+_training_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+_model_locks = {}
+
+def _safe_symbol(symbol: str) -> str:
+    # Symbols come straight from the URL, so keep only characters tickers actually use
+    return re.sub(r"[^A-Z0-9.^=-]", "_", symbol.upper())
+
+def _model_path(safe_symbol: str, last_date: str) -> str:
+    return os.path.join(_MODEL_CACHE_DIR, f"{safe_symbol}_{last_date}_v{_MODEL_FILE_VERSION}.joblib")
+
+def _prune_model_files(safe_symbol: str, keep: str):
+    # Drop other dates/versions of the same symbol and anything past the max age. The
+    # date has to follow the symbol directly, so pruning BF leaves BF_B's files alone.
+    same_symbol = re.compile(re.escape(safe_symbol) + r"_\d{4}-\d{2}-\d{2}_[^_]+\.joblib")
+    cutoff = time.time() - _MODEL_FILE_MAX_AGE
+    for entry in os.scandir(_MODEL_CACHE_DIR):
+        if entry.path == keep or not entry.name.endswith(".joblib"):
+            continue
+        try:
+            if same_symbol.fullmatch(entry.name) or entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            # Another worker may have removed it first
+            pass
+
+def _fit_random_forest(symbol: str, last_date: str, X_train: np.ndarray, y_train: np.ndarray):
+    safe_symbol = _safe_symbol(symbol)
+    path = _model_path(safe_symbol, last_date)
+    try:
+        return load(path)
+    except (FileNotFoundError, EOFError):
+        # Not written yet, or pruned by another worker since; fit it again
+        pass
+    # The pool already spreads work over every core, so each fit stays single threaded
+    model = RandomForestRegressor(n_estimators=200, random_state=42, n_jobs=1)
+    model.fit(X_train, y_train)
+    os.makedirs(_MODEL_CACHE_DIR, exist_ok=True)
+    # Write then rename so other workers never load a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    dump(model, tmp_path, compress=3)
+    os.replace(tmp_path, path)
+    _prune_model_files(safe_symbol, path)
+    return model
+
+async def _get_model(symbol: str, last_date: str, X_train, y_train, model_type: ModelType = "ridge"):
+    key = (symbol.upper(), last_date, model_type)
+    # One fit per key at a time so concurrent requests share the result
+    async with _keyed_lock(_model_locks, key):
+        cached = _model_cache.get(key)
+        if cached is not None:
+            _model_cache.move_to_end(key)
+            return cached
+
+        if model_type == "random_forest":
+            # Forests work on float32 X internally, so downcast once instead of copying on every fit
+            future = _training_pool.submit(
+                _fit_random_forest, key[0], last_date, X_train.to_numpy(dtype=np.float32), y_train.to_numpy()
+            )
+            model = await asyncio.wrap_future(future)
+            # Converting 200 trees to ONNX takes a noticeable fraction of a second, keep it off the loop
+            predict_row = await asyncio.to_thread(_row_predictor, model)
+        else:
+            model = Ridge(alpha=1.0).fit(X_train.to_numpy(), y_train.to_numpy())
+            predict_row = _row_predictor(model)
+
+        cached = (model, predict_row)
+        _model_cache[key] = cached
+        if len(_model_cache) > _MODEL_CACHE_SIZE:
+            _model_cache.popitem(last=False)
+    return cached
+
+@njit(cache=True, error_model="numpy")
+def _rolling_features(close):
+    # MA5, MA10 and momentum in one pass, NaN until each window is full like pandas
+    n = close.shape[0]
+    ma5 = np.full(n, np.nan)
+    ma10 = np.full(n, np.nan)
+    momentum = np.full(n, np.nan)
+    sum5 = 0.0
+    sum10 = 0.0
+    for i in range(n):
+        sum5 += close[i]
+        sum10 += close[i]
+        if i >= 5:
+            sum5 -= close[i - 5]
+        if i >= 10:
+            sum10 -= close[i - 10]
+        if i >= 4:
+            ma5[i] = sum5 / 5
+        if i >= 9:
+            ma10[i] = sum10 / 10
+        if i >= 1:
+            momentum[i] = close[i] / close[i - 1] - 1
+    return ma5, ma10, momentum
+
+# Words and phrases that trigger VADER's negation, booster, "but", "least" and idiom rules
+_VADER_MODIFIERS = set(NEGATE) | set(BOOSTER_DICT) | {"no", "but", "least", "kind", "so", "this"}
+_VADER_PHRASES = list(SPECIAL_CASES) + [k for k in BOOSTER_DICT if " " in k]
+
+# Sample headlines for sentiment analysis
+HEADLINE_TEMPLATES = [
+    "{symbol} stock rises after strong earnings report",
+    "Analysts show mixed sentiment toward {symbol}",
+    "{symbol} faces supply chain issues, investors react cautiously"
+]
+# VADER treats the ticker as a neutral token, so the average only needs computing once
+_YF_SENTIMENT_CONST = sum(
+    analyzer.polarity_scores(h.format(symbol="XXX"))['compound'] for h in HEADLINE_TEMPLATES
+) / len(HEADLINE_TEMPLATES)
+
+def headline_sentiment(symbol: str):
+    token = symbol.lower()
+    if token in analyzer.lexicon or token in _VADER_MODIFIERS:
+        # Tickers that are also sentiment or modifier words (e.g. GOOD, BUT) do affect the score
+        scores = [analyzer.polarity_scores(h.format(symbol=symbol))['compound'] for h in HEADLINE_TEMPLATES]
+        return sum(scores) / len(scores)
+    return _YF_SENTIMENT_CONST
+
+def _fast_compound(text: str) -> float:
+    # Plain lexicon sum with VADER's tokenizing, caps and punctuation rules; anything
+    # needing the context-sensitive rules (or emoji translation) goes through VADER itself
+    lowered = text.lower()
+    if not text.isascii() or any(phrase in lowered for phrase in _VADER_PHRASES):
+        return analyzer.polarity_scores(text)['compound']
+
+    words = []
+    for token in text.split():
+        stripped = token.strip(string.punctuation)
+        words.append(stripped if len(stripped) > 2 else token)
+    lower_words = [w.lower() for w in words]
+    if any(w in _VADER_MODIFIERS or "n't" in w for w in lower_words):
+        return analyzer.polarity_scores(text)['compound']
+
+    allcaps = sum(1 for w in words if w.isupper())
+    is_cap_diff = 0 < len(words) - allcaps < len(words)
+    total = 0.0
+    for word, lower in zip(words, lower_words):
+        valence = analyzer.lexicon.get(lower)
+        if valence is None:
+            continue
+        if is_cap_diff and word.isupper():
+            valence += C_INCR if valence > 0 else -C_INCR
+        total += valence
+    if total == 0:
+        return 0.0
 
-def reddit_sentiment_analysis(symbol: str, limit: int = 25):
-    subreddit = reddit.subreddit("stocks")
-    reddit_scores = []
-    for submission in subreddit.search(symbol, limit=limit):
-        title = submission.title
-        score = analyzer.polarity_scores(title)['compound']
-        reddit_scores.append(score)
+    # Exclamation and question mark emphasis, as in VADER's score_valence
+    emphasis = min(text.count("!"), 4) * 0.292
+    question_marks = text.count("?")
+    if question_marks > 1:
+        emphasis += question_marks * 0.18 if question_marks <= 3 else 0.96
+    total += emphasis if total > 0 else -emphasis
+    return round(normalize(total), 4)
+
+@lru_cache(maxsize=4096)
+def _title_sentiment(title: str) -> float:
+    return _fast_compound(title)
+
+REDDIT_SUBREDDITS = ["stocks", "wallstreetbets", "investing"]
+
+async def _search_subreddit(name: str, symbol: str, limit: int):
+    subreddit = await reddit.subreddit(name)
+    return [_title_sentiment(submission.title) async for submission in subreddit.search(symbol, limit=limit)]
+
+async def reddit_sentiment_analysis(symbol: str, limit: int = 25):
+    # Search each subreddit concurrently, splitting the limit so we stay within Reddit's rate limit
+    per_subreddit = max(1, limit // len(REDDIT_SUBREDDITS))
+    results = await asyncio.gather(
+        *(_search_subreddit(name, symbol, per_subreddit) for name in REDDIT_SUBREDDITS)
+    )
+    reddit_scores = [score for scores in results for score in scores]
     if (not reddit_scores):
        return 0 
     else:
         return (sum(reddit_scores) / len(reddit_scores))
     
+# Ticker news lists, kept for 5 minutes
+_news_cache = TTLCache(maxsize=512, ttl=300)
+
+@cached(_news_cache, key=lambda symbol: symbol.upper(), lock=threading.Lock())
+def _ticker_news(symbol: str):
+    return yf.Ticker(symbol, session=_yf_session).news or []
+
 def yfinance_news_sentiment_analysis(symbol: str, limit: int = 10):
     try:
-        ticker = yf.Ticker(symbol)
-        news = ticker.news
+        news = _ticker_news(symbol)
         
         if not news:
             print(f"No news found for {symbol}")
             return 0, []
         
-        scores = []
-        headlines = []
-        
-        # Limit to specified number of articles
-        for article in news[:limit]:
-            # Get the title of the article
-            title = article.get('title', '')
-            if title:
-                score = analyzer.polarity_scores(title)['compound']
-                scores.append(score)
-                headlines.append({
-                    'title': title,
-                    'sentiment': score,
-                    'publisher': article.get('publisher', 'Unknown'),
-                    'link': article.get('link', '')
-                })
+        # Limit to specified number of articles that have a title
+        articles = [article for article in news[:limit] if article.get('title', '')]
+        scores = [_title_sentiment(article['title']) for article in articles]
+        headlines = [
+            {
+                'title': article['title'],
+                'sentiment': score,
+                'publisher': article.get('publisher', 'Unknown'),
+                'link': article.get('link', '')
+            }
+            for article, score in zip(articles, scores)
+        ]
         
         avg_score = sum(scores) / len(scores) if scores else 0
         return avg_score, headlines
@@ -79,10 +359,10 @@ def yfinance_news_sentiment_analysis(symbol: str, limit: int = 10):
         print(f"Error fetching news for {symbol}: {e}")
         return 0, []
 
-def predict_future_prices(symbol: str, days: int = 7):
+async def predict_future_prices(symbol: str, days: int = 7, model_type: ModelType = "ridge"):
     try:
         # Fetch last 6 months of data
-        data = yf.download(symbol, period="6mo", interval="1d")
+        data = await _cached_download(symbol, "6mo", "1d")
 
         if data.empty or len(data) < 30:
             return []
@@ -94,9 +374,7 @@ def predict_future_prices(symbol: str, days: int = 7):
         data = data.dropna(subset=["Close"])
 
         data["Day"] = pd.Series(range(len(data)))
-        data["MA5"] = data["Close"].rolling(window=5).mean()
-        data["MA10"] = data["Close"].rolling(window=10).mean()
-        data["Momentum"] = data["Close"].pct_change()
+        data["MA5"], data["MA10"], data["Momentum"] = _rolling_features(data["Close"].to_numpy(dtype=np.float64))
         data = data.dropna()
 
         X = data[["Day", "MA5", "MA10", "Momentum"]]
@@ -107,26 +385,34 @@ def predict_future_prices(symbol: str, days: int = 7):
             X, y, test_size=0.2, shuffle=False
         )
 
-        # Train Random Forest
-        model = RandomForestRegressor(n_estimators=200, random_state=42)
-        model.fit(X_train, y_train)
-
         last_day = data["Day"].iloc[-1]
         last_date = data["Date"].iloc[-1]
+
+        # Train the model, reusing the cached one until a new bar arrives
+        _, predict_row = await _get_model(symbol, str(last_date.date()), X_train, y_train, model_type)
         future_predictions = []
 
-        recent_closes = list(data["Close"].iloc[-10:])
+        # Last 10 closes followed by the forecast, with running sums for the moving averages
+        closes = np.empty(10 + days)
+        closes[:10] = data["Close"].iloc[-10:].to_numpy()
+        sum5 = closes[5:10].sum()
+        sum10 = closes[:10].sum()
+        # Feature row reused across iterations: Day, MA5, MA10, Momentum
+        X_next = np.empty((1, 4))
 
         for i in range(1, days + 1):
-            next_day = last_day + i
-            ma5 = pd.Series(recent_closes[-5:]).mean()
-            ma10 = pd.Series(recent_closes[-10:]).mean()
-            momentum = (recent_closes[-1] - recent_closes[-2]) / recent_closes[-2] if len(recent_closes) > 1 else 0
+            n = 9 + i  # number of known closes
+            X_next[0, 0] = last_day + i
+            X_next[0, 1] = sum5 / 5
+            X_next[0, 2] = sum10 / 10
+            X_next[0, 3] = (closes[n - 1] - closes[n - 2]) / closes[n - 2]
 
-            X_next = pd.DataFrame([[next_day, ma5, ma10, momentum]], columns=["Day", "MA5", "MA10", "Momentum"])
-            pred = model.predict(X_next)[0]
+            pred = predict_row(X_next)
 
-            recent_closes.append(pred)
+            # Each prediction feeds the next day's features, so rows can't be batched
+            closes[n] = pred
+            sum5 += pred - closes[n - 5]
+            sum10 += pred - closes[n - 10]
             future_predictions.append({
                 "date": (last_date + timedelta(days=i)).strftime("%Y-%m-%d"),
                 "predicted_close": float(pred)
@@ -137,10 +423,42 @@ def predict_future_prices(symbol: str, days: int = 7):
         print(f"Prediction error: {e}")
         return []
 
-@app.get("/compare/{symbol}")
-def compare_stock(symbol: str):
-    # fetch historical stock data
-    data = yf.download(symbol, period="1mo", interval="1d")
+@app.on_event("startup")
+async def warmup():
+    # Pay the one-off costs (training workers, Numba compile, ONNX converter setup,
+    # first Yahoo request) before serving so the first user request isn't slower.
+    # The workers start first, before this process creates any ONNX session threads.
+    await asyncio.wrap_future(_training_pool.submit(os.getpid))
+    _rolling_features(np.ones(10))
+    analyzer.polarity_scores("warm up")
+    _row_predictor(RandomForestRegressor(n_estimators=2).fit(np.zeros((4, 4), dtype=np.float32), np.zeros(4)))
+    try:
+        await _cached_download("AAPL", "5d", "1d")
+    except Exception as e:
+        print(f"Warmup download failed: {e}")
+
+@app.on_event("startup")
+async def create_reddit():
+    global reddit
+    reddit = asyncpraw.Reddit(
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent="my-stock-sentiment-app by u/YourRedditUsername",
+    )
+
+@app.on_event("shutdown")
+async def shutdown():
+    if reddit is not None:
+        await reddit.close()
+    _training_pool.shutdown(cancel_futures=True)
+
+async def _compare(symbol: str, model_type: ModelType):
+    # fetch historical stock data, Reddit sentiment and the forecast concurrently
+    data, reddit_sentiment_scores, predictions = await asyncio.gather(
+        _cached_download(symbol, "1mo", "1d"),
+        reddit_sentiment_analysis(symbol),
+        predict_future_prices(symbol, 7, model_type),
+    )
 
     if data.empty or len(data) < 2:
         raise HTTPException(status_code=404, detail=f"{symbol} data not found or insufficient data from Yahoo Finance.")
@@ -157,22 +475,12 @@ def compare_stock(symbol: str):
         raise HTTPException(status_code=404, detail=f"Insufficient valid data for {symbol}")
     
     # Convert Date to string format
-    data["Date"] = data["Date"].dt.strftime("%Y-%m-%d")
+    data["Date"] = data["Date"].values.astype("datetime64[D]").astype(str)
 
     
 
-    # Sample headlines for sentiment analysis
-    headlines = [
-        f"{symbol} stock rises after strong earnings report",
-        f"Analysts show mixed sentiment toward {symbol}",
-        f"{symbol} faces supply chain issues, investors react cautiously"
-    ]
-
-    scores = [analyzer.polarity_scores(h)['compound'] for h in headlines]
-
     # Calculate mean sentiment score
-    reddit_sentiment_scores = reddit_sentiment_analysis(symbol)
-    yfinance_sentiment_scores = sum(scores) / len(scores) 
+    yfinance_sentiment_scores = headline_sentiment(symbol)
     avg_sentiment = (yfinance_sentiment_scores + reddit_sentiment_scores) / 2
     
     # % change in price
@@ -187,17 +495,15 @@ def compare_stock(symbol: str):
     data["MA5"] = data["Close"].rolling(window=5).mean()
 
     # Prepare historical data
-    historical_data = []
-    for _, row in data.iterrows():
-        historical_data.append({
-            "date": row["Date"],
-            "close": float(row["Close"]),
-            "ma5": float(row["MA5"]) if pd.notna(row["MA5"]) else None,
-            "predicted_close": None  # Historical data has no predictions
-        })
+    dates = data["Date"].tolist()
+    closes = data["Close"].astype(float).tolist()
+    ma5 = data["MA5"].astype(object).where(data["MA5"].notna(), None).tolist()
+    historical_data = [
+        {"date": d, "close": c, "ma5": m, "predicted_close": None}  # Historical data has no predictions
+        for d, c, m in zip(dates, closes, ma5)
+    ]
 
-    # Get predictions and append them
-    predictions = predict_future_prices(symbol, 7)
+    # Append predictions
     for pred in predictions:
         historical_data.append({
             "date": pred["date"],
@@ -217,6 +523,47 @@ def compare_stock(symbol: str):
 
     }
 
+# Responses are returned as ORJSONResponse directly so FastAPI skips the
+# jsonable_encoder walk over every historical row
+@app.get("/compare/{symbol}", response_class=ORJSONResponse)
+async def compare_stock(symbol: str, model_type: ModelType = "ridge"):
+    return ORJSONResponse(await _compare(symbol, model_type))
+
+# Each symbol runs its own Reddit searches (one per subreddit), so this keeps a single
+# batch at 15 Reddit requests, well inside the 60 per minute budget
+MAX_BATCH_SYMBOLS = 5
+
+@app.get("/compare_batch", response_class=ORJSONResponse)
+async def compare_batch(symbols: str, model_type: ModelType = "ridge"):
+    # Comma separated tickers, e.g. /compare_batch?symbols=AAPL,MSFT
+    symbol_list = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="No symbols provided.")
+    if len(symbol_list) > MAX_BATCH_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SYMBOLS} symbols per batch.")
+
+    # One download per period for the whole batch; _compare then reads from the cache
+    await asyncio.gather(
+        _prefetch_downloads(symbol_list, "1mo", "1d"),
+        _prefetch_downloads(symbol_list, "6mo", "1d"),
+    )
+    results = await asyncio.gather(*(_compare(s, model_type) for s in symbol_list), return_exceptions=True)
+
+    comparisons = []
+    errors = {}
+    for symbol, result in zip(symbol_list, results):
+        if isinstance(result, HTTPException):
+            errors[symbol] = result.detail
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            comparisons.append(result)
+
+    return ORJSONResponse({
+        "results": comparisons,
+        "errors": errors
+    })
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
     uvicorn.run("main:app", host="0.0.0.0", port=port)
\ No newline at end of file